@@ -1,10 +1,11 @@
 """Crawling OpenAlex either via general search or citation BFS"""
 
-from collections import deque
 import math
 from typing import Dict, Optional, List, Iterator, Union
 
+from .network import getIntegerIDFromOpenAlex
 from .utils import OAAPI, _pageIterator, _cursorIterator
+from .utils.cache import DEFAULT_TTL
 from . import log_context
 import logging
 
@@ -13,22 +14,29 @@ logger = logging.getLogger(__name__)
 
 
 class EntitiesCrawler:
-    def __init__(self, email=None):
+    def __init__(self, email=None, cacheResponses=True, cacheTTL=DEFAULT_TTL):
+        """Crawls OpenAlex, caching responses on disk by default.
+
+        Pass cacheResponses=False to always hit the API (e.g. for list or
+        search queries whose results change as OpenAlex grows), or tune how
+        long cached responses stay fresh with cacheTTL (seconds; None never
+        expires).
+        """
         self.email = email
-        self._api = OAAPI()
+        self._api = OAAPI(
+            cacheResponses=cacheResponses, cacheTTL=cacheTTL, email=email
+        )
 
     @classmethod
     def getFilterString(cls, filters: Dict[str, str]):
-        filtersList = []
-        for filter, value in filters.items():
-            filtersList.append(f"{filter}:{value}")
-        return ",".join(filtersList)
+        return ",".join(f"{filter}:{value}" for filter, value in filters.items())
 
     def getEntities(
         self,
         filter: Dict[Optional[str], Optional[str]] = {},
         search="",
         sort=[],
+        select=[],
         maxEntities=10000,
         rateInterval=0.0,
     ) -> Union[_pageIterator, _cursorIterator]:
@@ -43,6 +51,11 @@ class EntitiesCrawler:
         if sort:
             parameters["sort"] = ",".join(sort)
 
+        if select:
+            # Ask OpenAlex to return only these fields; large unused fields
+            # such as abstract_inverted_index are never transferred or parsed.
+            parameters["select"] = ",".join(select)
+
         if self.email:
             parameters["mailto"] = self.email
 
@@ -69,7 +82,9 @@ class EntitiesCrawler:
 
         logger.debug("Finished first API call, returning iterator.")
         logger.info(
-            f"Total entities found: {totalEntries}, Pages to fetch: {numberOfPages}"
+            "Total entities found: %d, Pages to fetch: %d",
+            totalEntries,
+            numberOfPages,
         )
         if totalEntries <= 10000:
             return _pageIterator(
@@ -94,45 +109,90 @@ class EntitiesCrawler:
             )
 
     def citationBFS(
-        self, root: List[str], maxLevels=10, maxNodes=10000
+        self, root: List[str], maxLevels=10, maxNodes=10000, select=[]
     ) -> Iterator[dict]:
-        """Performs BFS on OpenAlex citations, up to a certain depth and node limit."""
+        """Performs BFS on OpenAlex citations, up to a certain depth and node limit.
+
+        When select is given, only those fields (plus id and referenced_works,
+        which the BFS itself needs) are requested from OpenAlex.
+        """
+        if select:
+            select = sorted(set(select) | {"id", "referenced_works"})
         self._api.profiler.reset()
-        queue = deque([(r, 0) for r in root])  # (publication_id, level)
+        currentLayer = list(root)  # All publication IDs at the current depth
         numNodesProcessed = 0  # Track number of processed nodes
-        visited = set(root)
-
-        while queue:
-            if maxNodes is not None and numNodesProcessed >= maxNodes:
-                break  # Stop if maxNodes limit is reached
-
-            current_publication_id, level = queue.popleft()
-            if level >= maxLevels:
-                continue  # Stop expanding deeper
-            with log_context({"WID": current_publication_id}):
-                response = self._api.makeOASingleWorksCall(
-                    current_publication_id, mailto=self.email
-                )
-
-            # TODO (reza): Add functionality to provide a report on the dataset such as
-            #   WIDs that didn't return a response
-            if not response:
-                logger.error(
-                    f"Error while getting works object for {current_publication_id}."
-                )
-                continue
-
-            if "referenced_works" not in response:
-                logger.error(
-                    f"This work has no referenced works {current_publication_id}"
+        # Track visited works by their integer ID: hashing small ints is much
+        # cheaper than hashing "W..." strings and the set stays ~10x smaller.
+        # Roots in a non-OpenAlex form (e.g. a DOI) have no integer ID yet;
+        # they are marked visited once their response reveals it.
+        visited = set()
+        for r in root:
+            try:
+                visited.add(getIntegerIDFromOpenAlex(r))
+            except ValueError:
+                pass
+
+        # Layer-synchronous BFS: every vertex at depth d is fetched before
+        # depth d+1 starts, so a whole layer's requests fan out concurrently
+        # instead of being serialized through a FIFO queue.
+        for level in range(maxLevels):
+            if not currentLayer:
+                break
+            nextLayer = []
+
+            # Fetch the layer in budget-sized slices; failed lookups do not
+            # count as processed nodes, so the remainder of the layer can
+            # still use up the maxNodes budget.
+            offset = 0
+            while offset < len(currentLayer):
+                if maxNodes is not None and numNodesProcessed >= maxNodes:
+                    return  # Stop if maxNodes limit is reached
+                budget = len(currentLayer) - offset
+                if maxNodes is not None:
+                    budget = min(budget, maxNodes - numNodesProcessed)
+                layer = currentLayer[offset : offset + budget]
+                offset += budget
+
+                responses = self._api.makeOABatchWorksCalls(
+                    layer, mailto=self.email, select=select
                 )
-                continue
-
-            numNodesProcessed += 1
 
-            for referenced_work in response["referenced_works"]:
-                referenced_id = referenced_work.split("/")[-1]  # Extract ID
-                if referenced_id not in visited:
-                    visited.add(referenced_id)
-                    queue.append((referenced_id, level + 1))
-            yield response
+                # Mark every work in the slice visited before extracting any
+                # references, so a root first known by a non-OpenAlex form
+                # cannot be re-queued as another work's reference.
+                validResponses = []
+                for current_publication_id, response in zip(layer, responses):
+                    with log_context({"WID": current_publication_id}):
+                        # TODO (reza): Add functionality to provide a report on the dataset such as
+                        #   WIDs that didn't return a response
+                        if not response:
+                            logger.error(
+                                "Error while getting works object for %s.",
+                                current_publication_id,
+                            )
+                            continue
+
+                        if "referenced_works" not in response:
+                            logger.error(
+                                "This work has no referenced works %s",
+                                current_publication_id,
+                            )
+                            continue
+
+                    numNodesProcessed += 1
+                    if "id" in response:
+                        visited.add(getIntegerIDFromOpenAlex(response["id"]))
+                    validResponses.append(response)
+
+                for response in validResponses:
+                    for referenced_work in response["referenced_works"]:
+                        referenced_id = referenced_work[
+                            referenced_work.rfind("/") + 1 :
+                        ]  # Extract ID
+                        referenced_int = int(referenced_id[1:])
+                        if referenced_int not in visited:
+                            visited.add(referenced_int)
+                            nextLayer.append(referenced_id)
+                    yield response
+
+            currentLayer = nextLayer
@@ -1,25 +1,36 @@
 """Create a citation network based on an iterator on OpenAlex Work Objects"""
 
-import json
+import array
+import itertools
+
 import igraph as ig
+import numpy as np
 from typing import Dict, Iterator, Union, List
 from tqdm.auto import tqdm
 
 from .utils import _pageIterator, _cursorIterator
 
 
-def getIntegerIDFromOpenAlex(openAlexId: str):
-    return int(openAlexId.split("/")[-1][1:])
+def getIntegerIDFromOpenAlex(openAlexId: str, _cache: Dict[str, int] = {}):
+    # Slice past the last "/" and the "W" prefix directly; unlike split("/")
+    # this allocates no intermediate list on the per-reference hot path.
+    # Referenced IDs repeat heavily across works (citation overlap), so the
+    # parse is memoized; the default-arg dict is shared across calls, which
+    # is intentional and fine on this single-threaded ingest path.
+    integerID = _cache.get(openAlexId)
+    if integerID is None:
+        integerID = int(openAlexId[openAlexId.rfind("/") + 2 :])
+        _cache[openAlexId] = integerID
+    return integerID
 
 
 def processPublicationAttributes(attributes, attributes_to_keep):
-    attributes_to_keep = set(attributes_to_keep)
-    attributes = {k: v for k, v in attributes.items() if k in attributes_to_keep}
-    for k, v in attributes.items():
-        if not isinstance(v, (int, float, str)):
-
-            attributes[k] = json.dumps(v)
-    return attributes
+    # attributes_to_keep is a handful of keys while a work carries dozens of
+    # fields, so iterate the keep-set rather than the whole attributes dict.
+    # Non-scalar values (authorships, topics, ...) are kept as native
+    # dicts/lists; they are only serialized if/when the graph is written to
+    # CSV, not once per work at build time.
+    return {k: attributes[k] for k in attributes_to_keep if k in attributes}
 
 
 # TODO: Finish building a citation network
@@ -38,45 +49,108 @@ def createCitationGraph(
         "abstract_inverted_index",
     ],
 ):
+    numEntities = len(entities) if hasattr(entities, "__len__") else None
     progress = tqdm(
-        total=len(entities) if hasattr(entities, "__len__") else None,
+        total=numEntities,
         desc="Creating the citation graph",
         leave=False,
         dynamic_ncols=True,
     )
 
-    nodeAttributes = {}
-    nodeReferences = []
-    oaIntID2Index = {}
-    index2oaIntID = []
-
-    for work in entities:
-        progress.update(1)
-
-        oaIntegerID = getIntegerIDFromOpenAlex(work["id"])
-        attributes = processPublicationAttributes(work, attributes_to_keep)
-
-        oaIntID2Index[oaIntegerID] = len(index2oaIntID)
-        index2oaIntID.append(oaIntegerID)
-        nodeReferences.append(
-            [
+    # Pre-keyed columns (SoA layout): no per-attribute membership test in
+    # the ingest loop, and every column stays aligned with the vertex list
+    # even when a work is missing an attribute.
+    # Allocate everything at final size when the iterator knows its length
+    # and fill by index; integer IDs live in a packed array('q') instead of
+    # a list of boxed ints.
+    attributesToKeep = frozenset(attributes_to_keep)  # Built once, not per work
+    if numEntities:
+        nodeAttributes = {k: [None] * numEntities for k in attributes_to_keep}
+        index2oaIntID = array.array("q", bytes(8 * numEntities))
+        nodeReferences = [None] * numEntities
+    else:
+        nodeAttributes = {k: [] for k in attributes_to_keep}
+        index2oaIntID = array.array("q")
+        nodeReferences = []
+
+    # Ingest page-sized batches when the iterator exposes them (one progress
+    # update per page instead of per work); plain iterables are chunked the
+    # same way so the loop body stays uniform.
+    if hasattr(entities, "iterPages"):
+        pages = entities.iterPages()
+    else:
+        entityIterator = iter(entities)
+        pages = iter(lambda: list(itertools.islice(entityIterator, 200)), [])
+
+    numWorks = 0
+    for page in pages:
+        progress.update(len(page))
+        for work in page:
+            oaIntegerID = getIntegerIDFromOpenAlex(work["id"])
+            # Inlined processPublicationAttributes: one dict comprehension on
+            # the per-work hot path, no function-call overhead.
+            attributes = {k: work[k] for k in attributesToKeep if k in work}
+
+            references = [
                 getIntegerIDFromOpenAlex(referenced_work)
                 for referenced_work in work["referenced_works"]
             ]
-        )
-
-        for k, v in attributes.items():
-            if k not in nodeAttributes:
-                nodeAttributes[k] = []
-            nodeAttributes[k].append(v)
+            if numWorks < len(index2oaIntID):
+                index2oaIntID[numWorks] = oaIntegerID
+                nodeReferences[numWorks] = references
+                for k, column in nodeAttributes.items():
+                    column[numWorks] = attributes.get(k)
+            else:
+                index2oaIntID.append(oaIntegerID)
+                nodeReferences.append(references)
+                for k, column in nodeAttributes.items():
+                    column.append(attributes.get(k))
+            numWorks += 1
 
     progress.close()
 
-    citationEdges = []
-    for pub_idx, references in enumerate(nodeReferences):
-        for reference in references:
-            if reference in oaIntID2Index:
-                citationEdges.append((pub_idx, oaIntID2Index[reference]))
+    # Trim in case the iterator yielded fewer entries than it advertised
+    if numWorks < len(index2oaIntID):
+        del index2oaIntID[numWorks:]
+        del nodeReferences[numWorks:]
+        for column in nodeAttributes.values():
+            del column[numWorks:]
+
+    # Resolve all references against the crawled ID set in bulk with NumPy
+    # (sorted lookup via searchsorted) instead of one dict probe per edge.
+    # A work's vertex index is its position in index2oaIntID, so no id->index
+    # dict (~100 bytes per boxed int pair) is kept at all: the packed
+    # array('q') is viewed as int64 and sorted once.
+    idArray = np.frombuffer(index2oaIntID, dtype=np.int64)
+    sortedIndices = np.argsort(idArray)
+    sortedIDs = idArray[sortedIndices]
+
+    referenceCounts = [len(references) for references in nodeReferences]
+    numReferences = sum(referenceCounts)
+    src = np.repeat(np.arange(len(nodeReferences), dtype=np.int64), referenceCounts)
+    if numReferences:
+        # One fromiter pass over the chained reference lists; no per-work
+        # temporary arrays to concatenate.
+        dstIDs = np.fromiter(
+            itertools.chain.from_iterable(nodeReferences),
+            dtype=np.int64,
+            count=numReferences,
+        )
+        positions = np.minimum(np.searchsorted(sortedIDs, dstIDs), len(sortedIDs) - 1)
+        valid = sortedIDs[positions] == dstIDs
+        # igraph consumes the 2-column array directly (no per-edge unboxing
+        # of Python int tuples), so keep it in NumPy form.
+        citationEdges = np.column_stack((src[valid], sortedIndices[positions[valid]]))
+        del dstIDs, positions, valid
+    else:
+        citationEdges = np.empty((0, 2), dtype=np.int64)
+
+    # The reference lists dominate the heap once attributes are whitelisted
+    # (tens of millions of boxed ints on a large crawl) and are dead now
+    # that the edge array exists; release them before igraph materializes
+    # its own copy of the graph so the two never coexist at peak.
+    del nodeReferences, referenceCounts, src
+
     g = ig.Graph(
         n=len(index2oaIntID),
         edges=citationEdges,
@@ -1,3 +1,4 @@
+from .cache import _ResponseCache
 from .utils import (
     _APIProfiler,
     OAAPI,
@@ -8,6 +9,7 @@ from .iterators import _pageIterator, _cursorIterator
 
 __all__ = [
     "_APIProfiler",
+    "_ResponseCache",
     "OAAPI",
     "_pageIterator",
     "_cursorIterator",
@@ -0,0 +1,134 @@
+"""Persistent caching of OpenAlex API responses"""
+
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+import os.path as osp
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .jsonio import json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "~/.cache/openalex"
+DEFAULT_TTL = 30 * 24 * 60 * 60  # OpenAlex records are stable; keep for 30 days
+MEMORY_CACHE_SIZE = 10_000
+
+
+class _ResponseCache:
+    """Two-tier response cache keyed on the full request URL.
+
+    Responses are kept in a bounded in-memory LRU front and mirrored to disk
+    (sha256 of the URL, fanned out over two directory levels) so that re-runs
+    of the same crawl skip the network entirely for unchanged requests.
+
+    The server's ETag is stored alongside each response; entries older than
+    the TTL are not returned by get() but remain available through
+    getStale() so the caller can revalidate them with If-None-Match instead
+    of re-downloading the full body.
+    """
+
+    def __init__(
+        self,
+        baseDir: str = DEFAULT_CACHE_DIR,
+        ttl: Optional[float] = DEFAULT_TTL,
+        memorySize: int = MEMORY_CACHE_SIZE,
+    ):
+        self._baseDir = osp.expanduser(baseDir)
+        self._ttl = ttl
+        self._memorySize = memorySize
+        # Maps requestURL -> (response, etag, storedAt); the executor's
+        # worker threads share this tier, so every access holds the lock.
+        self._memory: OrderedDict[
+            str, Tuple[Dict[str, Any], Optional[str], float]
+        ] = OrderedDict()
+        self._memoryLock = threading.Lock()
+
+    def _path(self, requestURL: str) -> str:
+        key = hashlib.sha256(requestURL.encode()).hexdigest()
+        return osp.join(self._baseDir, key[:2], key[2:4], f"{key[4:]}.json")
+
+    def _remember(
+        self,
+        requestURL: str,
+        response: Dict[str, Any],
+        etag: Optional[str],
+        storedAt: Optional[float] = None,
+    ) -> None:
+        if storedAt is None:
+            storedAt = time.time()
+        with self._memoryLock:
+            self._memory[requestURL] = (response, etag, storedAt)
+            self._memory.move_to_end(requestURL)
+            while len(self._memory) > self._memorySize:
+                self._memory.popitem(last=False)
+
+    def _load(self, requestURL: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        path = self._path(requestURL)
+        try:
+            with open(path, "rb") as f:
+                payload = json_loads(f.read())
+        except FileNotFoundError:
+            return None, None
+        except (OSError, ValueError) as e:
+            logger.warning("Discarding unreadable cache entry %s: %s", path, e)
+            return None, None
+        try:
+            return payload["response"], payload.get("etag")
+        except (KeyError, TypeError):
+            logger.warning("Discarding cache entry with unknown layout %s", path)
+            return None, None
+
+    def get(self, requestURL: str) -> Optional[Dict[str, Any]]:
+        with self._memoryLock:
+            entry = self._memory.get(requestURL)
+            if entry is not None:
+                response, _, storedAt = entry
+                if self._ttl is None or time.time() - storedAt <= self._ttl:
+                    self._memory.move_to_end(requestURL)
+                    return response
+
+        path = self._path(requestURL)
+        try:
+            mtime = osp.getmtime(path)
+            if self._ttl is not None and time.time() - mtime > self._ttl:
+                return None
+        except OSError:
+            return None
+        response, etag = self._load(requestURL)
+        if response is None:
+            return None
+
+        # Keep the file's age so the memory tier expires at the same time
+        # as the disk entry it mirrors.
+        self._remember(requestURL, response, etag, storedAt=mtime)
+        return response
+
+    def getStale(
+        self, requestURL: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Returns (response, etag) ignoring the TTL, or (None, None).
+
+        A stale response must not be used directly; it is meant to be
+        revalidated against the API with If-None-Match.
+        """
+        with self._memoryLock:
+            entry = self._memory.get(requestURL)
+            if entry is not None:
+                return entry[0], entry[1]
+        return self._load(requestURL)
+
+    def put(
+        self, requestURL: str, response: Dict[str, Any], etag: Optional[str] = None
+    ) -> None:
+        self._remember(requestURL, response, etag)
+        path = self._path(requestURL)
+        try:
+            os.makedirs(osp.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(json_dumps({"etag": etag, "response": response}))
+        except OSError as e:
+            logger.warning("Failed to write cache entry %s: %s", path, e)
@@ -1,9 +1,15 @@
+from collections import deque
 import logging
+import urllib.parse
+
 from .utils import OAAPI
 
 
 logger = logging.getLogger()
 
+# How many page requests the iterator keeps in flight ahead of the consumer.
+PREFETCH_PAGES = 4
+
 
 class _pageIterator:
     def __init__(
@@ -23,27 +29,59 @@ class _pageIterator:
         self._totalEntriesPerPage = totalEntriesPerPage
         self._totalPages = totalPages
         self._rateInterval = rateInterval
+        # Encode the (constant) base query string once; the page loop only
+        # appends the per_page/page suffix.
+        baseParameters = {
+            k: v
+            for k, v in self._parameters.items()
+            if k not in ("page", "per_page")
+        }
+        baseQS = urllib.parse.urlencode(baseParameters)
+        self._urlPrefix = f"https://api.openalex.org/{entityType}?"
+        if baseQS:
+            self._urlPrefix += f"{baseQS}&"
 
-    def __iter__(self):
+    def iterPages(self):
+        """Yields whole pages (lists of works) instead of individual entries.
+
+        Consumers that work in batches (e.g. graph construction) avoid the
+        per-entry generator hand-off by iterating pages directly.
+        """
         self._processedEntries = 0
-        for page in range(1, self._totalPages + 1):
-            logger.info(f"Fetching page {page}/{self._totalPages}")
-
-            self._parameters["page"] = page
-            self._parameters["per_page"] = self._totalEntriesPerPage
-            responsePage = self._api.makeOAAPICall(
-                self._entityType, self._parameters, rateInterval=self._rateInterval
-            )
-            shouldBreak = False
-            for pageEntry in responsePage["results"]:
-                if self._processedEntries < self._totalEntries:
-                    self._processedEntries += 1
-                    yield pageEntry
-                else:
-                    shouldBreak = True
-                    break
-            if shouldBreak:
-                break
+        # Fan page requests out on the shared API executor, keeping up to
+        # PREFETCH_PAGES requests in flight at once, and consume the futures
+        # in page order so yield order (and the totalEntries cutoff) match a
+        # serial crawl. Fetch errors surface when the page's future resolves.
+        pending = deque()
+        nextPage = 1
+
+        while nextPage <= self._totalPages or pending:
+            while nextPage <= self._totalPages and len(pending) < PREFETCH_PAGES:
+                logger.info("Fetching page %d/%d", nextPage, self._totalPages)
+
+                requestURL = (
+                    f"{self._urlPrefix}per_page={self._totalEntriesPerPage}"
+                    f"&page={nextPage}"
+                )
+                pending.append(
+                    self._api.makeOAAPICallURLAsync(
+                        requestURL, rateInterval=self._rateInterval
+                    )
+                )
+                nextPage += 1
+
+            results = pending.popleft().result()["results"]
+            remaining = self._totalEntries - self._processedEntries
+            if remaining <= 0:
+                return
+            if len(results) > remaining:
+                results = results[:remaining]
+            self._processedEntries += len(results)
+            yield results
+
+    def __iter__(self):
+        for page in self.iterPages():
+            yield from page
 
     def __len__(self):
         return self._totalEntries
@@ -67,29 +105,58 @@ class _cursorIterator:
         self._totalEntriesPerPage = totalEntriesPerPage
         self._totalPages = totalPages
         self._rateInterval = rateInterval
-        self._parameters["cursor"] = "*"
         self._processedEntries = 0
+        # Encode the (constant) base query string once; only the cursor
+        # changes between pages.
+        baseParameters = {
+            k: v
+            for k, v in self._parameters.items()
+            if k not in ("page", "per_page", "cursor")
+        }
+        baseQS = urllib.parse.urlencode(baseParameters)
+        self._urlPrefix = f"https://api.openalex.org/{entityType}?"
+        if baseQS:
+            self._urlPrefix += f"{baseQS}&"
 
-    def __iter__(self):
-        self._parameters["per_page"] = self._totalEntriesPerPage
+    def _pageURL(self, cursor):
+        return (
+            f"{self._urlPrefix}per_page={self._totalEntriesPerPage}"
+            f"&cursor={urllib.parse.quote(cursor)}"
+        )
+
+    def iterPages(self):
+        """Yields whole pages (lists of works) instead of individual entries."""
+        future = self._api.makeOAAPICallURLAsync(
+            self._pageURL("*"), rateInterval=self._rateInterval
+        )
         while True:
-            response = self._api.makeOAAPICall(
-                self._entityType, self._parameters, rateInterval=self._rateInterval
-            )
-            shouldBreak = False
-            for pageEntry in response["results"]:
-                self._processedEntries += 1
-                if self._processedEntries > self._totalEntries:
-                    shouldBreak = True
-                    break
-                yield pageEntry
-            if (
-                shouldBreak
-                or "next_cursor" not in response["meta"]
-                or not response["meta"]["next_cursor"]
-            ):
-                break
-            self._parameters["cursor"] = response["meta"]["next_cursor"]
+            response = future.result()
+            future = None
+
+            # Cursor pagination is inherently serial (each page's cursor
+            # comes from the previous response), but the next request can be
+            # launched before this page is yielded, overlapping its round
+            # trip with the consumer's per-entry work.
+            nextCursor = response["meta"].get("next_cursor")
+            if nextCursor:
+                future = self._api.makeOAAPICallURLAsync(
+                    self._pageURL(nextCursor), rateInterval=self._rateInterval
+                )
+
+            results = response["results"]
+            remaining = self._totalEntries - self._processedEntries
+            if remaining <= 0:
+                return
+            if len(results) > remaining:
+                results = results[:remaining]
+            self._processedEntries += len(results)
+            yield results
+            if future is None:
+                return
+
+    def __iter__(self):
+        for page in self.iterPages():
+            yield from page
 
     def __len__(self):
         return self._totalEntries
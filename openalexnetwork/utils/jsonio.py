@@ -0,0 +1,19 @@
+"""JSON encode/decode helpers that prefer orjson when it is installed"""
+
+try:
+    import orjson
+
+    def json_loads(data):
+        return orjson.loads(data)
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    import json
+
+    def json_loads(data):
+        return json.loads(data)
+
+    def json_dumps(obj) -> str:
+        return json.dumps(obj)